@@ -11,6 +11,7 @@ def index():
       "/js_run": "Run JavaScript Code and return output",
       "/ide-py": "Simple IDE that can test the Python API",
       "/ide-js": "Simple IDE that can test the JavaScript	 API",
+      "/js_cache": "Hit rate and compile-time savings of the JavaScript compile cache",
     }
   })
   
@@ -0,0 +1,141 @@
+import asyncio
+import codecs
+import os
+import weakref
+from .routes import pythonrun, jsrun
+
+# =============================
+# CONFIG
+# =============================
+MAX_CONCURRENT = 256            # sandboxes supervised at once by one event loop
+KILL_GRACE = 2                  # seconds allowed on top of EXEC_TIMEOUT
+
+# One semaphore per event loop; a semaphore cannot be shared across loops
+_slots = weakref.WeakKeyDictionary()
+
+def _semaphore():
+    loop = asyncio.get_running_loop()
+    if loop not in _slots:
+        _slots[loop] = asyncio.Semaphore(MAX_CONCURRENT)
+    return _slots[loop]
+
+def _remove(path):
+    if os.path.exists(path):
+        os.unlink(path)
+
+async def _kill(proc):
+    if proc.returncode is None:
+        proc.kill()
+    await proc.wait()
+
+# =============================
+# PYTHON
+# =============================
+async def _stream_py(proc, state):
+    # Same line-granular limit as pythonrun.execute_worker; a line longer
+    # than the stream limit can only mean the output limit is exceeded.
+    while True:
+        try:
+            raw = await proc.stdout.readline()
+        except ValueError:
+            state["exceeded"] = True
+            return
+        if not raw:
+            return
+        line = raw.decode("utf-8", errors="replace")
+        state["size"] += len(line)
+        if state["size"] > pythonrun.MAX_OUTPUT_SIZE:
+            state["exceeded"] = True
+            return
+        state["buffer"].append(line)
+
+async def run_py_async(data):
+    """Async equivalent of the /run-py route; returns (payload, status)."""
+    # File work (temp scripts, cache blobs) runs in threads to keep the loop free
+    temp_path, rejected = await asyncio.to_thread(pythonrun.prepare_worker, data)
+    if rejected:
+        return rejected
+
+    state = {"buffer": [], "size": 0, "exceeded": False}
+    async with _semaphore():
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *pythonrun.worker_command(temp_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                limit=pythonrun.MAX_OUTPUT_SIZE * 4 + 1,
+            )
+            try:
+                await asyncio.wait_for(_stream_py(proc, state), pythonrun.EXEC_TIMEOUT + KILL_GRACE)
+                if state["exceeded"]:
+                    await _kill(proc)
+                else:
+                    await asyncio.wait_for(proc.wait(), KILL_GRACE)
+            except asyncio.TimeoutError:
+                await _kill(proc)
+                return pythonrun.TIMEOUT_RESPONSE
+            finally:
+                await _kill(proc)
+        finally:
+            await asyncio.to_thread(_remove, temp_path)
+
+    return pythonrun.build_response("".join(state["buffer"]), proc.returncode, state["exceeded"])
+
+# =============================
+# JAVASCRIPT
+# =============================
+async def _stream_js(proc, state):
+    # Character-granular limit, matching jsrun.execute_wrapper
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    while True:
+        raw = await proc.stdout.read(4096)
+        text = decoder.decode(raw, final=not raw)
+        room = jsrun.MAX_OUTPUT_SIZE - state["size"]
+        if len(text) > room:
+            state["buffer"].append(text[:room])
+            state["size"] += room
+            state["exceeded"] = True
+            return
+        state["buffer"].append(text)
+        state["size"] += len(text)
+        if not raw:
+            return
+
+async def run_js_async(data):
+    """Async equivalent of the /run_js route; returns (payload, status)."""
+    temp_path, rejected = await asyncio.to_thread(jsrun.prepare_wrapper, data)
+    if rejected:
+        return rejected
+
+    state = {"buffer": [], "size": 0, "exceeded": False}
+    async with _semaphore():
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *jsrun.wrapper_command(temp_path),
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+            )
+            stderr_task = asyncio.ensure_future(proc.stderr.read())
+            try:
+                await asyncio.wait_for(_stream_js(proc, state), jsrun.EXEC_TIMEOUT + KILL_GRACE)
+                if state["exceeded"]:
+                    await _kill(proc)
+                stderr_data = await asyncio.wait_for(stderr_task, KILL_GRACE)
+                await asyncio.wait_for(proc.wait(), KILL_GRACE)
+            except asyncio.TimeoutError:
+                stderr_task.cancel()
+                await _kill(proc)
+                return jsrun.TIMEOUT_RESPONSE
+            finally:
+                await _kill(proc)
+        finally:
+            await asyncio.to_thread(jsrun.cleanup_wrapper, temp_path)
+
+    stderr_text = stderr_data.decode("utf-8", errors="replace")
+    return jsrun.build_response("".join(state["buffer"]), proc.returncode, state["exceeded"], stderr_text)
+
+# Served natively by asgi.py, relative to the coderun_bp url prefix
+ROUTES = {
+    "/run-py": run_py_async,
+    "/run_js": run_js_async,
+}
@@ -0,0 +1,137 @@
+import hashlib
+import json
+import numbers
+import threading
+from collections import OrderedDict
+
+# =============================
+# CONFIG
+# =============================
+MAX_ENTRIES = 256               # compiled scripts kept per process
+MAX_BYTES = 32 * 1024 * 1024    # total V8 code-cache bytes kept per process
+
+# Side files the JS wrapper reads/writes next to its own script, inside the
+# private per-run directory created by jsrun.prepare_wrapper()
+CACHE_IN_SUFFIX = ".cache"       # code cache handed to the wrapper on a hit
+CACHE_OUT_SUFFIX = ".cache-out"  # code cache produced by the wrapper
+META_SUFFIX = ".meta"            # {"compile_ms", "cached", "rejected"}
+
+def source_key(source):
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()
+
+class ScriptCache:
+    """Bounded LRU of V8 code-cache data, keyed by the hash of the compiled source.
+
+    Every run_js() spawns a fresh node process, so the cache lives here and
+    is handed to isolated-vm's compileScriptSync() as `cachedData`.
+    """
+
+    def __init__(self, max_entries=MAX_ENTRIES, max_bytes=MAX_BYTES):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._pending = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.rejected = 0
+        self.cold_compile_ms = 0.0
+        self.warm_compile_ms = 0.0
+        self.saved_ms = 0.0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry["data"]
+
+    def _put(self, key, data, compile_ms):
+        if key in self._entries:
+            self._bytes -= len(self._entries.pop(key)["data"])
+        if len(data) > self.max_bytes:
+            return
+        self._entries[key] = {"data": data, "compile_ms": compile_ms}
+        self._bytes += len(data)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, old = self._entries.popitem(last=False)
+            self._bytes -= len(old["data"])
+
+    def prepare(self, temp_path, key):
+        """Remember `key` for this run and place cached data next to the wrapper, if any."""
+        with self._lock:
+            self._pending[temp_path] = key
+        data = self.get(key)
+        if data is not None:
+            with open(temp_path + CACHE_IN_SUFFIX, "wb") as f:
+                f.write(data)
+
+    def collect(self, temp_path):
+        """Record what the wrapper reported; the caller removes the run directory."""
+        with self._lock:
+            key = self._pending.pop(temp_path, None)
+        if key is None:
+            return
+        meta = _read_meta(temp_path + META_SUFFIX)
+        if meta is None:
+            # Wrapper never got past compilation (syntax error, kill, crash)
+            return
+        try:
+            with open(temp_path + CACHE_OUT_SUFFIX, "rb") as f:
+                produced = f.read()
+        except OSError:
+            produced = None
+
+        compile_ms = meta["compile_ms"]
+        with self._lock:
+            entry = self._entries.get(key)
+            if meta["cached"] and not meta["rejected"]:
+                self.hits += 1
+                self.warm_compile_ms += compile_ms
+                if entry is not None:
+                    self.saved_ms += max(entry["compile_ms"] - compile_ms, 0)
+                return
+            if meta["rejected"]:
+                self.rejected += 1
+            self.misses += 1
+            self.cold_compile_ms += compile_ms
+            if produced:
+                self._put(key, produced, compile_ms)
+            elif entry is not None:
+                self._bytes -= len(self._entries.pop(key)["data"])
+
+    def stats(self):
+        with self._lock:
+            runs = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "rejected": self.rejected,
+                "hit_rate": round(self.hits / runs, 4) if runs else None,
+                "avg_cold_compile_ms": round(self.cold_compile_ms / self.misses, 3) if self.misses else None,
+                "avg_warm_compile_ms": round(self.warm_compile_ms / self.hits, 3) if self.hits else None,
+                "compile_ms_saved": round(self.saved_ms, 3),
+            }
+
+def _read_meta(path):
+    """Parsed wrapper meta, or None if missing or malformed."""
+    try:
+        with open(path) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(meta, dict):
+        return None
+    if not isinstance(meta.get("compile_ms"), numbers.Real) or isinstance(meta.get("compile_ms"), bool):
+        return None
+    if not isinstance(meta.get("cached"), bool) or not isinstance(meta.get("rejected"), bool):
+        return None
+    return meta
+
+script_cache = ScriptCache()
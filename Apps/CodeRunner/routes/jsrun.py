@@ -3,8 +3,10 @@ from flask import request, jsonify
 import subprocess
 import tempfile
 import os
+import shutil
 import sys
 import json
+from ..jscache import script_cache, source_key, CACHE_IN_SUFFIX, CACHE_OUT_SUFFIX, META_SUFFIX
 
 # =============================
 # CONFIG
@@ -12,19 +14,39 @@ import json
 EXEC_TIMEOUT = 10
 MAX_OUTPUT_SIZE = 10_000
 MAX_MEMORY_MB = 128
+ISOLATED_VM_PATH = "/home/ayero/public_html/Apps/CodeRunner/routes/node_modules/isolated-vm"
 
-@coderun_bp.route("/run_js", methods=["POST"])
-def run_js():
-    data = request.get_json(silent=True)
+TIMEOUT_RESPONSE = ({"Status": False, "Message": "Execution timed out"}, 408)
+
+# Compiled together with the user code; must not depend on the request's
+# inputs so the V8 code cache can be reused across runs.
+SCRIPT_PRELUDE = """
+const console = { log: (...args) => log.applySync(undefined, args) };
+const input = () => __input.applySync(undefined, []);
+"""
+
+# =============================
+# WRAPPER PREPARATION
+# =============================
+def prepare_wrapper(data):
+    """Validate a request body and write its isolated-vm wrapper to a temp file.
+
+    Returns (temp_path, None), or (None, (payload, status)) when rejected.
+    """
     if not data or "code" not in data:
-        return jsonify({"Status": False, "Message": "Missing 'code' field"}), 400
+        return None, ({"Status": False, "Message": "Missing 'code' field"}, 400)
 
     code = data.get("code", "")
+    if not isinstance(code, str):
+        return None, ({"Status": False, "Message": "'code' must be a string"}, 400)
     user_inputs = data.get("input", [])
+    source = SCRIPT_PRELUDE + code
+    cache_key = source_key(source)
 
     # The wrapper is the 'security guard' for the V8 Isolate
     wrapper_code = f"""
-const ivm = require('/home/ayero/public_html/Apps/CodeRunner/routes/node_modules/isolated-vm');
+const fs = require('fs');
+const ivm = require({json.dumps(ISOLATED_VM_PATH)});
 const isolate = new ivm.Isolate({{ memoryLimit: {MAX_MEMORY_MB} }});
 const context = isolate.createContextSync();
 const jail = context.global;
@@ -37,16 +59,36 @@ jail.setSync('log', new ivm.Reference((...args) => {{
     process.stdout.write(args.join(' ') + '\\n');
 }}));
 
-jail.setSync('input', new ivm.Reference(() => {{
+jail.setSync('__input', new ivm.Reference(() => {{
     return inputs[inputIdx++];
 }}));
 
+// Warm V8 code cache from a previous run of the same source, if any
+let cachedData;
+try {{
+    cachedData = fs.readFileSync(__filename + {json.dumps(CACHE_IN_SUFFIX)});
+}} catch (e) {{}}
+
 try {{
-    const script = isolate.compileScriptSync(`
-        const console = {{ log: (...args) => log.applySync(undefined, args) }};
-        const input = () => input.applySync(undefined, []);
-        {code}
-    `);
+    const started = process.hrtime.bigint();
+    const script = isolate.compileScriptSync({json.dumps(source)}, {{
+        produceCachedData: true,
+        ...(cachedData && {{
+            cachedData: new ivm.ExternalCopy(cachedData.buffer.slice(cachedData.byteOffset, cachedData.byteOffset + cachedData.length))
+        }})
+    }});
+    const compileMs = Number(process.hrtime.bigint() - started) / 1e6;
+
+    // Report back to the parent before running untrusted code
+    if (script.cachedData) {{
+        fs.writeFileSync(__filename + {json.dumps(CACHE_OUT_SUFFIX)}, Buffer.from(script.cachedData.copy()));
+    }}
+    fs.writeFileSync(__filename + {json.dumps(META_SUFFIX)}, JSON.stringify({{
+        compile_ms: compileMs,
+        cached: !!cachedData,
+        rejected: !!script.cachedDataRejected
+    }}));
+
     script.runSync(context, {{ timeout: {EXEC_TIMEOUT * 1000} }});
 }} catch (e) {{
     // If it's a timeout, we send a specific string for the parent to catch
@@ -59,28 +101,69 @@ try {{
 }}
 """
 
-    with tempfile.NamedTemporaryFile("w+", suffix=".js", delete=False) as f:
+    # Private (0700) per-run directory: the wrapper's cache side files live
+    # next to it and must not be reachable by other users of /tmp
+    run_dir = tempfile.mkdtemp(prefix="jsrun-")
+    temp_path = os.path.join(run_dir, "wrapper.js")
+    with open(temp_path, "w") as f:
         f.write(wrapper_code)
-        temp_path = f.name
+    script_cache.prepare(temp_path, cache_key)
+    return temp_path, None
+
+def cleanup_wrapper(temp_path):
+    try:
+        script_cache.collect(temp_path)
+    finally:
+        shutil.rmtree(os.path.dirname(temp_path), ignore_errors=True)
+
+def wrapper_command(temp_path):
+    return ["node", temp_path]
+
+# =============================
+# FINAL API RESPONSE
+# =============================
+def build_response(final_output, returncode, output_exceeded, stderr_data):
+    # The wrapper reports isolate timeouts on stderr
+    if "ISOLATE_TIMEOUT" in stderr_data:
+        return TIMEOUT_RESPONSE
+
+    if output_exceeded:
+        return {
+            "Status": False, 
+            "Message": "Output limit exceeded",
+            "Output": final_output + "\n[KILLED: MAX OUTPUT REACHED]"
+        }, 413
 
-    # =============================
-    # PARENT MONITORING LOOP
-    # =============================
+    if returncode != 0:
+        return {
+            "Status": False,
+            "Message": "Runtime Error",
+            "Output": stderr_data.strip() or "Runtime Error"
+        }, 400
+
+    return {
+        "Status": True,
+        "Output": final_output
+    }, 200
+
+# =============================
+# PARENT MONITORING LOOP
+# =============================
+def execute_wrapper(temp_path):
     output_buffer = []
     current_size = 0
     output_exceeded = False
-    runtime_error_msg = "Runtime Error"
-
-    # Start Node process
-    proc = subprocess.Popen(
-        ["node", temp_path],
-        stdout=subprocess.PIPE,
-        stderr=subprocess.PIPE, # Keep stderr separate for error parsing
-        text=True,
-        bufsize=1
-    )
 
     try:
+        # Start Node process; inside the try so a failed spawn still cleans up
+        proc = subprocess.Popen(
+            wrapper_command(temp_path),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE, # Keep stderr separate for error parsing
+            text=True,
+            bufsize=1
+        )
+
         # 1. Read stdout for user output
         # Using a simple read loop to monitor size
         while True:
@@ -95,40 +178,24 @@ try {{
         
         # 2. Capture stderr and return code
         stdout_rem, stderr_data = proc.communicate(timeout=2)
-        
-        if "ISOLATE_TIMEOUT" in stderr_data:
-            return jsonify({"Status": False, "Message": "Execution timed out"}), 408
-        
-        if stderr_data:
-            runtime_error_msg = stderr_data.strip()
-
     except subprocess.TimeoutExpired:
         proc.kill()
-        return jsonify({"Status": False, "Message": "Execution timed out"}), 408
+        return TIMEOUT_RESPONSE
     finally:
-        if os.path.exists(temp_path):
-            os.unlink(temp_path)
+        cleanup_wrapper(temp_path)
 
-    final_output = "".join(output_buffer)
+    return build_response("".join(output_buffer), proc.returncode, output_exceeded, stderr_data)
 
-    # =============================
-    # FINAL API RESPONSE
-    # =============================
-    if output_exceeded:
-        return jsonify({
-            "Status": False, 
-            "Message": "Output limit exceeded",
-            "Output": final_output + "\n[KILLED: MAX OUTPUT REACHED]"
-        }), 413
+@coderun_bp.route("/run_js", methods=["POST"])
+def run_js():
+    temp_path, rejected = prepare_wrapper(request.get_json(silent=True))
+    if rejected:
+        payload, status = rejected
+        return jsonify(payload), status
 
-    if proc.returncode != 0:
-        return jsonify({
-            "Status": False,
-            "Message": "Runtime Error",
-            "Output": runtime_error_msg
-        }), 400
+    payload, status = execute_wrapper(temp_path)
+    return jsonify(payload), status
 
-    return jsonify({
-        "Status": True,
-        "Output": final_output
-    })
\ No newline at end of file
+@coderun_bp.route("/js_cache", methods=["GET"])
+def js_cache_stats():
+    return jsonify(script_cache.stats())
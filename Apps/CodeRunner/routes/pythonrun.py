@@ -51,14 +51,19 @@ def safe_import(name, globals=None, locals=None, fromlist=(), level=0):
         raise ImportError(f"Import of '{name}' is not allowed")
     return original_import(name, globals, locals, fromlist, level)
 
+TIMEOUT_RESPONSE = ({"Status": False, "Message": "Execution timed out"}, 408)
+
 # =============================
-# ROUTE
+# WORKER PREPARATION
 # =============================
-@coderun_bp.route("/run-py", methods=["POST"])
-def run_code():
-    data = request.get_json(silent=True)
+def prepare_worker(data):
+    """Validate a request body and write its worker script to a temp file.
+
+    Returns (temp_path, None), or (None, (payload, status)) when rejected.
+    Shared by the WSGI route and the asyncio runner in Apps/CodeRunner/aio.py.
+    """
     if not data or "code" not in data:
-        return jsonify({"Status": False, "Message": "Missing 'code' field"}), 400
+        return None, ({"Status": False, "Message": "Missing 'code' field"}, 400)
 
     code = data.get("code", "")
     user_inputs = data.get("input", [])
@@ -67,7 +72,7 @@ def run_code():
         tree = ast.parse(code, mode="exec")
         validate_ast(tree)
     except Exception as e:
-        return jsonify({"Status": False, "Message": f"Invalid code: {e}"}), 400
+        return None, ({"Status": False, "Message": f"Invalid code: {e}"}, 400)
 
     # =============================
     # WORKER SCRIPT GENERATION
@@ -127,17 +132,44 @@ except Exception as e:
 
     with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
         f.write(worker_script)
-        temp_path = f.name
+        return f.name, None
 
-    # =============================
-    # PARENT-SIDE MONITORING
-    # =============================
+def worker_command(temp_path):
+    return [sys.executable, temp_path]
+
+# =============================
+# OUTPUT HANDLING
+# =============================
+def build_response(final_output, returncode, output_exceeded):
+    if output_exceeded:
+        return {
+            "Status": False,
+            "Message": "Output limit exceeded",
+            "Output": final_output + "\n[KILLED: MAX OUTPUT REACHED]"
+        }, 413
+
+    if returncode != 0 and not output_exceeded:
+        return {
+            "Status": False,
+            "Message": "Runtime Error",
+            "Output": final_output
+        }, 400
+
+    return {
+        "Status": True,
+        "Output": final_output
+    }, 200
+
+# =============================
+# PARENT-SIDE MONITORING
+# =============================
+def execute_worker(temp_path):
     output_buffer = []
     current_size = 0
     output_exceeded = False
     
     proc = subprocess.Popen(
-        [sys.executable, temp_path],
+        worker_command(temp_path),
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
@@ -157,31 +189,22 @@ except Exception as e:
         proc.wait(timeout=EXEC_TIMEOUT)
     except subprocess.TimeoutExpired:
         proc.kill()
-        return jsonify({"Status": False, "Message": "Execution timed out"}), 408
+        return TIMEOUT_RESPONSE
     finally:
         if os.path.exists(temp_path):
             os.unlink(temp_path)
 
-    final_output = "".join(output_buffer)
-
-    # =============================
-    # OUTPUT HANDLING
-    # =============================
-    if output_exceeded:
-        return jsonify({
-            "Status": False,
-            "Message": "Output limit exceeded",
-            "Output": final_output + "\n[KILLED: MAX OUTPUT REACHED]"
-        }), 413
+    return build_response("".join(output_buffer), proc.returncode, output_exceeded)
 
-    if proc.returncode != 0 and not output_exceeded:
-        return jsonify({
-            "Status": False,
-            "Message": "Runtime Error",
-            "Output": final_output
-        }), 400
+# =============================
+# ROUTE
+# =============================
+@coderun_bp.route("/run-py", methods=["POST"])
+def run_code():
+    temp_path, rejected = prepare_worker(request.get_json(silent=True))
+    if rejected:
+        payload, status = rejected
+        return jsonify(payload), status
 
-    return jsonify({
-        "Status": True,
-        "Output": final_output
-    })
+    payload, status = execute_worker(temp_path)
+    return jsonify(payload), status
@@ -1,7 +1,6 @@
 from flask import Flask, render_template, request, redirect, session, jsonify, abort
 from flask_cors import CORS
 import os, json, traceback
-from data.apps import APPS
 from dotenv import load_dotenv
 from flask.json.provider import DefaultJSONProvider
 from datetime import datetime
@@ -10,6 +9,7 @@ from logging.handlers import RotatingFileHandler
 from werkzeug.security import check_password_hash
 from users import USERS
 import action
+import health
 from Apps.CodeRunner import coderun_bp
 
 # ---------- JSON Provider ----------
@@ -101,6 +101,9 @@ def create_app():
     setup_logging(app)
     app.register_blueprint(coderun_bp, url_prefix=f"{BASE_URL}/coderunner")
     
+    # ---------- Background Health Probes ----------
+    health.init_health(app)
+    
     # ---------- Error Handlers ----------
     @app.errorhandler(400)
     def bad_request(error):
@@ -164,14 +167,18 @@ def create_app():
     @app.route('/')
     def index():
         app.logger.debug("Index page accessed from %s", request.remote_addr)
-        return render_template("index.html", apps=APPS)
+        return render_template("index.html", apps=health.apps_with_health())
     
     @app.route("/_health")
     def health_check():
+        # Served from cache only; probes run in the background. Always 200:
+        # if this answers, the web app is up, and check failures are in the body.
+        checks = health.monitor.snapshot()
         return jsonify({
-            "status": "healthy",
+            "status": health.overall_status(checks),
             "timestamp": datetime.now().isoformat(),
-            "service": "Flask App"
+            "service": "Flask App",
+            "checks": checks
         })
     
     @app.route("/login", methods=["GET","POST"])
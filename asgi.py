@@ -0,0 +1,99 @@
+"""ASGI entry point, run alongside passenger_wsgi.py.
+
+The sandbox routes of coderun_bp are served natively on the event loop
+(see Apps/CodeRunner/aio.py); every other request falls through to the
+regular Flask app. Serve with e.g. ``uvicorn asgi:application``.
+"""
+import sys, os, json
+from datetime import datetime
+sys.path.insert(0, os.path.dirname(__file__))
+from asgiref.wsgi import WsgiToAsgi
+from app import app, BASE_URL, safe_extract_traceback
+from Apps.CodeRunner import aio
+import health
+
+CODERUN_PREFIX = f"{BASE_URL}/coderunner"
+MAX_BODY_SIZE = 1024 * 1024     # bytes
+
+flask_app = WsgiToAsgi(app)
+
+# Sandboxes are capped by the event loop's semaphore, not by worker threads
+health.set_sandbox_limit(aio.MAX_CONCURRENT)
+
+def is_json(headers):
+    mimetype = headers.get(b"content-type", b"").split(b";")[0].strip().decode("latin-1").lower()
+    return mimetype == "application/json" or (mimetype.startswith("application/") and mimetype.endswith("+json"))
+
+async def read_body(receive):
+    body = b""
+    while True:
+        message = await receive()
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_SIZE:
+            return None
+        if not message.get("more_body"):
+            return body
+
+async def send_json(send, payload, status):
+    # Same encoding as CustomJSONProvider in app.py
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"access-control-allow-origin", b"*"),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+async def application(scope, receive, send):
+    if scope["type"] == "lifespan":
+        return await lifespan(receive, send)
+
+    path = scope.get("path", "")
+    handler = None
+    if scope["type"] == "http" and scope["method"] == "POST" and path.startswith(CODERUN_PREFIX):
+        handler = aio.ROUTES.get(path[len(CODERUN_PREFIX):])
+    if handler is None:
+        return await flask_app(scope, receive, send)
+
+    body = await read_body(receive)
+    if body is None:
+        return await send_json(send, {"Status": False, "Message": "Request body too large"}, 413)
+
+    # Mirrors request.get_json(silent=True)
+    data = None
+    if is_json(dict(scope["headers"])):
+        try:
+            data = json.loads(body)
+        except ValueError:
+            data = None
+
+    try:
+        payload, status = await handler(data)
+    except Exception as error:
+        # Same JSON shape as render_error_page() in app.py
+        error_traceback = safe_extract_traceback(error)
+        app.logger.error("500 Internal Server Error: %s %s\n%s", scope["method"], path, error_traceback)
+        payload, status = {
+            "success": False,
+            "error": "Internal Server Error",
+            "message": "Something went wrong on our end. We're working to fix it.",
+            "status_code": 500,
+            "path": path,
+            "method": scope["method"],
+            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "traceback": error_traceback
+        }, 500
+    await send_json(send, payload, status)
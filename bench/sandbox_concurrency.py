@@ -0,0 +1,63 @@
+"""Compare the threaded (WSGI) and asyncio (ASGI) sandbox execution paths.
+
+Runs the same batch of sandboxes through both paths in-process and prints
+wall time and throughput. The threaded path is capped by --threads, like a
+WSGI server's worker pool; the asyncio path by aio.MAX_CONCURRENT.
+
+    python bench/sandbox_concurrency.py --jobs 64 --threads 8
+    python bench/sandbox_concurrency.py --lang js
+"""
+import sys, os, time, argparse, asyncio
+from concurrent.futures import ThreadPoolExecutor
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from Apps.CodeRunner import aio
+from Apps.CodeRunner.routes import pythonrun, jsrun
+
+SNIPPETS = {
+    "py": {"code": "n = int(input())\nprint(sum(range(n)))", "input": ["100000"]},
+    "js": {"code": "const n = Number(input());\nlet s = 0;\nfor (let i = 0; i < n; i++) s += i;\nconsole.log(s);", "input": ["100000"]},
+}
+EXPECTED_OUTPUT = str(sum(range(100000)))
+
+def run_sync(lang, data):
+    if lang == "py":
+        temp_path, rejected = pythonrun.prepare_worker(data)
+        return rejected or pythonrun.execute_worker(temp_path)
+    temp_path, rejected = jsrun.prepare_wrapper(data)
+    return rejected or jsrun.execute_wrapper(temp_path)
+
+def bench_threads(lang, jobs, threads):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        results = list(pool.map(lambda _: run_sync(lang, SNIPPETS[lang]), range(jobs)))
+    return time.perf_counter() - start, results
+
+def bench_async(lang, jobs):
+    handler = aio.run_py_async if lang == "py" else aio.run_js_async
+    async def main():
+        return await asyncio.gather(*(handler(SNIPPETS[lang]) for _ in range(jobs)))
+    start = time.perf_counter()
+    results = asyncio.run(main())
+    return time.perf_counter() - start, results
+
+def report(name, elapsed, results, jobs):
+    # A run only counts if it produced the expected answer
+    ok = sum(1 for payload, status in results
+             if status == 200 and payload.get("Output", "").strip() == EXPECTED_OUTPUT)
+    print(f"{name:<10} {elapsed:8.2f}s  {jobs / elapsed:8.1f} runs/s  {ok}/{jobs} ok")
+    if ok != jobs:
+        payload, status = next(r for r in results
+                               if r[1] != 200 or r[0].get("Output", "").strip() != EXPECTED_OUTPUT)
+        print(f"  first failure (HTTP {status}): {payload}")
+    return ok == jobs
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lang", choices=SNIPPETS, default="py")
+    parser.add_argument("--jobs", type=int, default=64)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    passed = report(f"threads={args.threads}", *bench_threads(args.lang, args.jobs, args.threads), args.jobs)
+    passed &= report("asyncio", *bench_async(args.lang, args.jobs), args.jobs)
+    sys.exit(0 if passed else 1)
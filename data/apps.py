@@ -1,3 +1,5 @@
+# 'health' is the admin-set label; health.py only overrides it when a live probe
+# finds the app down or degraded.
 APPS = [
     {
         "id": "healingherb",
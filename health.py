@@ -0,0 +1,260 @@
+import os, sys, json, time, threading, subprocess, tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+import psutil
+from werkzeug.exceptions import NotFound
+from data.apps import APPS
+from Apps.CodeRunner.routes.jsrun import ISOLATED_VM_PATH
+
+# ---------------- Config ----------------
+TICK_INTERVAL = 1           # seconds between scheduler wake-ups
+PROBE_TIMEOUT = 5           # seconds a single probe may take
+HISTORY_SIZE = 20           # latency samples kept per check
+SLOW_PROBE_MS = 2000        # slower than this is reported as degraded
+SANDBOX_SOFT_LIMIT = 16     # default saturation threshold; override with the SANDBOX_SOFT_LIMIT env var
+
+APP_TTL = 30
+PYTHON_TTL = 60
+NODE_TTL = 300
+POOL_TTL = 5
+
+# Badge labels understood by templates/index.html
+HEALTH_LABELS = {
+    "ok": "Stable",
+    "degraded": "Degraded",
+    "down": "Currently Unavailable",
+}
+
+# ---------------- Probes ----------------
+# Every probe returns (status, detail) or (status, detail, log_detail) where status
+# is "ok", "degraded" or "down", or "unprobed" when the target cannot be checked
+# from this process. `detail` is served publicly by /_health, so it must not carry
+# server paths; anything more specific goes in `log_detail`, which is only logged.
+
+# In-process app requests get their own threads so a hanging route cannot hold
+# a monitor worker; at most one request per path is left in flight.
+_app_requests = ThreadPoolExecutor(max_workers=4, thread_name_prefix="health-app")
+_app_inflight = {}
+
+def _get_status(app, path):
+    with app.test_client() as client:
+        return client.get(path, follow_redirects=True).status_code
+
+def probe_app(app, path):
+    # Probes run in-process, so only paths this Flask app serves can be checked
+    try:
+        app.url_map.bind("localhost").match(path, method="GET")
+    except NotFound:
+        return "unprobed", "not served by this app"
+    except Exception:
+        # Redirects (e.g. missing trailing slash) and 405s still mean the path exists
+        pass
+    future = _app_inflight.get(path)
+    if future is not None and not future.done():
+        return "down", "previous probe still running"
+    future = _app_inflight[path] = _app_requests.submit(_get_status, app, path)
+    try:
+        status_code = future.result(timeout=PROBE_TIMEOUT)
+    except FutureTimeout:
+        return "down", f"probe timed out after {PROBE_TIMEOUT}s"
+    if status_code < 400:
+        return "ok", f"HTTP {status_code}"
+    return "down", f"HTTP {status_code}"
+
+def probe_python():
+    proc = subprocess.run(
+        [sys.executable, "-c", "print('ok')"],
+        capture_output=True, text=True, timeout=PROBE_TIMEOUT
+    )
+    if proc.returncode == 0 and proc.stdout.strip() == "ok":
+        return "ok", "interpreter started"
+    return "down", "interpreter failed to start", (proc.stderr.strip() or f"exit code {proc.returncode}")
+
+def probe_node():
+    try:
+        proc = subprocess.run(
+            ["node", "-e", f"require({json.dumps(ISOLATED_VM_PATH)}); process.stdout.write(process.version)"],
+            capture_output=True, text=True, timeout=PROBE_TIMEOUT
+        )
+    except FileNotFoundError:
+        return "down", "node executable not found"
+    if proc.returncode == 0:
+        return "ok", f"node {proc.stdout.strip()} with isolated-vm"
+    errors = [l.strip() for l in proc.stderr.splitlines() if "Error" in l]
+    return "down", "isolated-vm could not be loaded", errors[0] if errors else f"exit code {proc.returncode}"
+
+def probe_pool():
+    # Sandboxes are direct children running a temp script; probe children are not counted
+    tmp = tempfile.gettempdir()
+    active = 0
+    for child in psutil.Process().children():
+        try:
+            cmd = child.cmdline()
+        except psutil.Error:
+            continue
+        if len(cmd) > 1 and cmd[-1].startswith(tmp):
+            active += 1
+    limit = _sandbox_limit
+    detail = f"{active}/{limit} sandboxes running"
+    if active >= limit:
+        return "degraded", detail
+    return "ok", detail
+
+_sandbox_limit = SANDBOX_SOFT_LIMIT
+
+def set_sandbox_limit(limit):
+    """Use the serving mode's own concurrency cap (e.g. aio.MAX_CONCURRENT under asgi.py).
+
+    Under WSGI the cap is the server's thread count, which this process cannot
+    see; set SANDBOX_SOFT_LIMIT in the environment to match it.
+    """
+    global _sandbox_limit
+    _sandbox_limit = limit
+
+# ---------------- Monitor ----------------
+class HealthMonitor:
+    """Runs registered probes in the background and caches their results.
+
+    Readers never trigger a probe: they only see the last cached result.
+    """
+
+    def __init__(self):
+        self._checks = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stop = threading.Event()
+        self._executor = None
+        self.logger = None
+
+    def register(self, name, fn, ttl):
+        with self._lock:
+            self._checks[name] = {
+                "fn": fn,
+                "ttl": ttl,
+                "status": "pending",
+                "detail": None,
+                "checked_at": None,
+                "expires": 0,
+                "running": False,
+                "history": deque(maxlen=HISTORY_SIZE),
+            }
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._executor = ThreadPoolExecutor(max_workers=max(len(self._checks), 1), thread_name_prefix="health")
+        self._thread = threading.Thread(target=self._loop, name="health-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+        if self._executor:
+            self._executor.shutdown(wait=True)
+
+    def _loop(self):
+        while not self._stop.is_set():
+            self.run_due()
+            self._stop.wait(TICK_INTERVAL)
+
+    def run_due(self):
+        """Submit every expired, idle check to the executor."""
+        now = time.monotonic()
+        due = []
+        with self._lock:
+            for name, check in self._checks.items():
+                if not check["running"] and check["expires"] <= now:
+                    check["running"] = True
+                    due.append(name)
+        for name in due:
+            self._executor.submit(self._run_check, name)
+        return due
+
+    def _run_check(self, name):
+        fn = self._checks[name]["fn"]
+        start = time.perf_counter()
+        log_detail = None
+        try:
+            status, detail, *extra = fn()
+            log_detail = extra[0] if extra else None
+        except subprocess.TimeoutExpired:
+            status, detail = "down", f"probe timed out after {PROBE_TIMEOUT}s"
+        except Exception as e:
+            status, detail, log_detail = "down", "probe failed", f"{type(e).__name__}: {e}"
+        if log_detail and self.logger:
+            self.logger.warning("Health check %s is %s: %s", name, status, log_detail)
+        latency_ms = round((time.perf_counter() - start) * 1000, 2)
+        if status == "ok" and latency_ms > SLOW_PROBE_MS:
+            status = "degraded"
+        with self._lock:
+            check = self._checks[name]
+            check["status"] = status
+            check["detail"] = detail
+            check["checked_at"] = datetime.now().isoformat()
+            check["expires"] = time.monotonic() + check["ttl"]
+            check["running"] = False
+            check["history"].append(latency_ms)
+
+    def status(self, name):
+        with self._lock:
+            check = self._checks.get(name)
+            return check["status"] if check else None
+
+    def snapshot(self):
+        with self._lock:
+            checks = {}
+            for name, check in self._checks.items():
+                history = list(check["history"])
+                checks[name] = {
+                    "status": check["status"],
+                    "detail": check["detail"],
+                    "checked_at": check["checked_at"],
+                    "ttl": check["ttl"],
+                    "latency_ms": history[-1] if history else None,
+                    "avg_latency_ms": round(sum(history) / len(history), 2) if history else None,
+                    "history_ms": history,
+                }
+        return checks
+
+monitor = HealthMonitor()
+
+def overall_status(checks):
+    """degraded if any check found a problem, pending until every check has run, else healthy.
+
+    This only describes the sandboxes and registered apps; /_health answers 200
+    regardless, since a broken sandbox must not take the dashboard and other
+    apps out of a load balancer.
+    """
+    if any(c["status"] in ("degraded", "down") for c in checks.values()):
+        return "degraded"
+    if any(c["status"] == "pending" for c in checks.values()):
+        return "pending"
+    return "healthy"
+
+def apps_with_health():
+    """APPS entries whose 'health' is overridden only when a probe finds a problem.
+
+    Admin-set labels from data/apps.py (Beta, Maintenance, ...) are kept otherwise.
+    """
+    apps = []
+    for a in APPS:
+        status = monitor.status(f"app:{a['id']}")
+        if status in ("degraded", "down"):
+            apps.append({**a, "health": HEALTH_LABELS[status]})
+        else:
+            apps.append(dict(a))
+    return apps
+
+def init_health(app):
+    if os.getenv("SANDBOX_SOFT_LIMIT"):
+        set_sandbox_limit(int(os.getenv("SANDBOX_SOFT_LIMIT")))
+    monitor.logger = app.logger
+    for a in APPS:
+        monitor.register(f"app:{a['id']}", lambda path=a["path"]: probe_app(app, path), APP_TTL)
+    monitor.register("sandbox:python", probe_python, PYTHON_TTL)
+    monitor.register("sandbox:node", probe_node, NODE_TTL)
+    monitor.register("sandbox:pool", probe_pool, POOL_TTL)
+    monitor.start()